@@ -1,6 +1,9 @@
+import threading
 from contextlib import contextmanager
-from typing import Dict, Optional, cast
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
+import botocore.config
 from botocore.exceptions import ClientError
 
 from localstack import constants
@@ -25,7 +28,6 @@ from localstack.aws.api.es import (
     DescribeElasticsearchDomainsResponse,
     DisabledOperationException,
     DomainEndpointOptions,
-    DomainInfoList,
     DomainName,
     DomainNameList,
     EBSOptions,
@@ -50,7 +52,6 @@ from localstack.aws.api.es import (
     MaxResults,
     NextToken,
     NodeToNodeEncryptionOptions,
-    OptionStatus,
     PolicyDocument,
     ResourceAlreadyExistsException,
     ResourceNotFoundException,
@@ -71,118 +72,113 @@ from localstack.aws.api.opensearch import (
 )
 from localstack.utils.aws import aws_stack
 
+# Name of the backing service all EsProvider calls are delegated to
+_OPENSEARCH_SERVICE = "opensearch"
 
-def _version_to_opensearch(
-    version: Optional[ElasticsearchVersionString],
-) -> Optional[VersionString]:
-    if version is not None:
-        if version.startswith("OpenSearch_"):
-            return version
-        else:
-            return f"Elasticsearch_{version}"
+# Shared client config: a larger connection pool keeps the HTTP connections to the backend alive
+# across concurrent describe/list/tag calls, and the local backend doesn't warrant many retries
+_CLIENT_CONFIG = botocore.config.Config(max_pool_connections=50, retries={"max_attempts": 2})
 
+# Engine version prefixes (with their lengths) used to translate between the two APIs
+_ES_PREFIX = "Elasticsearch_"
+_ES_PREFIX_LEN = len(_ES_PREFIX)
+_OS_PREFIX = "OpenSearch_"
+_OS_PREFIX_LEN = len(_OS_PREFIX)
 
-def _version_from_opensearch(
-    version: Optional[VersionString],
-) -> Optional[ElasticsearchVersionString]:
-    if version is not None:
-        if version.startswith("Elasticsearch_"):
-            return version.split("_")[1]
-        else:
-            return version
+# Instance type suffixes (with their lengths) used to translate between the two APIs
+_ES_SUFFIX = ".elasticsearch"
+_ES_SUFFIX_LEN = len(_ES_SUFFIX)
+_OS_SUFFIX = ".search"
+_OS_SUFFIX_LEN = len(_OS_SUFFIX)
 
 
-def _instancetype_to_opensearch(instance_type: Optional[str]) -> Optional[str]:
-    if instance_type is not None:
-        return instance_type.replace("elasticsearch", "search")
+@lru_cache(maxsize=64)
+def _version_to_opensearch(version: ElasticsearchVersionString) -> VersionString:
+    if version[:_OS_PREFIX_LEN] == _OS_PREFIX:
+        return version
+    else:
+        return f"Elasticsearch_{version}"
 
 
-def _instancetype_from_opensearch(instance_type: Optional[str]) -> Optional[str]:
-    if instance_type is not None:
-        return instance_type.replace("search", "elasticsearch")
+@lru_cache(maxsize=64)
+def _version_from_opensearch(version: VersionString) -> ElasticsearchVersionString:
+    if version[:_ES_PREFIX_LEN] == _ES_PREFIX:
+        return version[_ES_PREFIX_LEN:]
+    else:
+        return version
 
 
-def _clusterconfig_from_opensearch(
-    cluster_config: Optional[ClusterConfig],
-) -> Optional[ElasticsearchClusterConfig]:
+def _instancetype_to_opensearch(instance_type: Optional[str]) -> Optional[str]:
+    if instance_type is not None:
+        if instance_type.endswith(_ES_SUFFIX):
+            return instance_type[:-_ES_SUFFIX_LEN] + _OS_SUFFIX
+        return instance_type
+
+
+def _clusterconfig_from_opensearch(cluster_config: ClusterConfig) -> ElasticsearchClusterConfig:
+    # The typed dicts only differ in the instance type names, which are adjusted in-place
+    for key in ("InstanceType", "DedicatedMasterType", "WarmType"):
+        instance_type = cluster_config.get(key)
+        if instance_type is not None and instance_type.endswith(_OS_SUFFIX):
+            cluster_config[key] = instance_type[:-_OS_SUFFIX_LEN] + _ES_SUFFIX
+    return cluster_config
+
+
+def _domainstatus_from_opensearch(domain_status: DomainStatus) -> ElasticsearchDomainStatus:
+    # Only specifically handle keys which are named differently or their values differ (version and clusterconfig)
+    engine_version = domain_status.pop("EngineVersion", None)
+    domain_status["ElasticsearchVersion"] = engine_version and _version_from_opensearch(
+        engine_version
+    )
+    # Inlined cluster config translation to keep this a single walk over the status dict
+    cluster_config = domain_status.pop("ClusterConfig", None)
     if cluster_config is not None:
-        # Just take the whole typed dict and typecast it to our target type
-        result = cast(ElasticsearchClusterConfig, cluster_config)
-
-        # Adjust the instance type names
-        result["InstanceType"] = _instancetype_from_opensearch(cluster_config.get("InstanceType"))
-        result["DedicatedMasterType"] = _instancetype_from_opensearch(
-            cluster_config.get("DedicatedMasterType")
-        )
-        result["WarmType"] = _instancetype_from_opensearch(cluster_config.get("WarmType"))
-        return result
-
-
-def _domainstatus_from_opensearch(
-    domain_status: Optional[DomainStatus],
-) -> Optional[ElasticsearchDomainStatus]:
-    if domain_status is not None:
-        # Just take the whole typed dict and typecast it to our target type
-        result = cast(ElasticsearchDomainStatus, domain_status)
-        # Only specifically handle keys which are named differently or their values differ (version and clusterconfig)
-        result["ElasticsearchVersion"] = _version_from_opensearch(
-            domain_status.get("EngineVersion")
-        )
-        result["ElasticsearchClusterConfig"] = _clusterconfig_from_opensearch(
-            domain_status.get("ClusterConfig")
-        )
-        result.pop("EngineVersion", None)
-        result.pop("ClusterConfig", None)
-        return result
+        for key in ("InstanceType", "DedicatedMasterType", "WarmType"):
+            instance_type = cluster_config.get(key)
+            if instance_type is not None and instance_type.endswith(_OS_SUFFIX):
+                cluster_config[key] = instance_type[:-_OS_SUFFIX_LEN] + _ES_SUFFIX
+    domain_status["ElasticsearchClusterConfig"] = cluster_config
+    return domain_status
 
 
 def _clusterconfig_to_opensearch(
-    elasticsearch_cluster_config: Optional[ElasticsearchClusterConfig],
-) -> Optional[ClusterConfig]:
-    if elasticsearch_cluster_config is not None:
-        result = cast(ClusterConfig, elasticsearch_cluster_config)
-        result["InstanceType"] = _instancetype_to_opensearch(result.get("InstanceType"))
-        result["DedicatedMasterType"] = _instancetype_to_opensearch(
-            result.get("DedicatedMasterType")
-        )
-        result["WarmType"] = _instancetype_to_opensearch(result.get("WarmType"))
-        return result
-
-
-def _domainconfig_from_opensearch(
-    domain_config: Optional[DomainConfig],
-) -> Optional[ElasticsearchDomainConfig]:
-    if domain_config is not None:
-        result = cast(ElasticsearchDomainConfig, domain_config)
-        engine_version = domain_config.get("EngineVersion", {})
-        result["ElasticsearchVersion"] = ElasticsearchVersionStatus(
-            Options=_version_from_opensearch(engine_version.get("Options")),
-            Status=cast(OptionStatus, engine_version.get("Status")),
-        )
-        cluster_config = domain_config.get("ClusterConfig", {})
-        result["ElasticsearchClusterConfig"] = ElasticsearchClusterConfigStatus(
-            Options=_clusterconfig_from_opensearch(cluster_config.get("Options")),
-            Status=cluster_config.get("Status"),
-        )
-        result.pop("EngineVersion", None)
-        result.pop("ClusterConfig", None)
-        return result
+    elasticsearch_cluster_config: ElasticsearchClusterConfig,
+) -> ClusterConfig:
+    for key in ("InstanceType", "DedicatedMasterType", "WarmType"):
+        instance_type = elasticsearch_cluster_config.get(key)
+        if instance_type is not None and instance_type.endswith(_ES_SUFFIX):
+            elasticsearch_cluster_config[key] = instance_type[:-_ES_SUFFIX_LEN] + _OS_SUFFIX
+    return elasticsearch_cluster_config
+
+
+def _domainconfig_from_opensearch(domain_config: DomainConfig) -> ElasticsearchDomainConfig:
+    engine_version = domain_config.pop("EngineVersion", {})
+    version_options = engine_version.get("Options")
+    domain_config["ElasticsearchVersion"] = ElasticsearchVersionStatus(
+        Options=version_options and _version_from_opensearch(version_options),
+        Status=engine_version.get("Status"),
+    )
+    cluster_config = domain_config.pop("ClusterConfig", {})
+    cluster_options = cluster_config.get("Options")
+    domain_config["ElasticsearchClusterConfig"] = ElasticsearchClusterConfigStatus(
+        Options=cluster_options and _clusterconfig_from_opensearch(cluster_options),
+        Status=cluster_config.get("Status"),
+    )
+    return domain_config
 
 
 def _compatible_version_list_from_opensearch(
-    compatible_version_list: Optional[CompatibleVersionsList],
-) -> Optional[CompatibleElasticsearchVersionsList]:
-    if compatible_version_list is not None:
-        return [
-            CompatibleVersionsMap(
-                SourceVersion=_version_from_opensearch(version_map["SourceVersion"]),
-                TargetVersions=[
-                    _version_from_opensearch(target_version)
-                    for target_version in version_map["TargetVersions"]
-                ],
-            )
-            for version_map in compatible_version_list
-        ]
+    compatible_version_list: CompatibleVersionsList,
+) -> CompatibleElasticsearchVersionsList:
+    # Bind the helper to a local name to avoid the global lookup in the inner loop
+    _vfo = _version_from_opensearch
+    return [
+        CompatibleVersionsMap(
+            SourceVersion=_vfo(version_map["SourceVersion"]),
+            TargetVersions=[*map(_vfo, version_map["TargetVersions"])],
+        )
+        for version_map in compatible_version_list
+    ]
 
 
 @contextmanager
@@ -209,6 +205,42 @@ def exception_mapper():
 
 
 class EsProvider(EsApi):
+    # Optional create_domain fields which are passed through untranslated, in the order of the
+    # create_elasticsearch_domain parameters
+    _CREATE_FIELDS = (
+        "EBSOptions",
+        "AccessPolicies",
+        "SnapshotOptions",
+        "VPCOptions",
+        "CognitoOptions",
+        "EncryptionAtRestOptions",
+        "NodeToNodeEncryptionOptions",
+        "AdvancedOptions",
+        "LogPublishingOptions",
+        "DomainEndpointOptions",
+        "AdvancedSecurityOptions",
+        "AutoTuneOptions",
+        "TagList",
+    )
+
+    def __init__(self):
+        # Cache the opensearch clients (one per region) to avoid the client setup overhead on every request
+        self._clients: Dict[str, Any] = {}
+        self._clients_mutex = threading.Lock()
+
+    def _client(self, region: str):
+        """Returns the opensearch client for the given region (and creates and caches it if necessary)."""
+        client = self._clients.get(region)
+        if client is None:
+            with self._clients_mutex:
+                client = self._clients.setdefault(
+                    region,
+                    aws_stack.connect_to_service(
+                        _OPENSEARCH_SERVICE, region_name=region, config=_CLIENT_CONFIG
+                    ),
+                )
+        return client
+
     def create_elasticsearch_domain(
         self,
         context: RequestContext,
@@ -229,34 +261,37 @@ class EsProvider(EsApi):
         auto_tune_options: AutoTuneOptionsInput = None,
         tag_list: TagList = None,
     ) -> CreateElasticsearchDomainResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
         # If no version is given, we set our default elasticsearch version
         engine_version = (
             _version_to_opensearch(elasticsearch_version)
             if elasticsearch_version
             else constants.ELASTICSEARCH_DEFAULT_VERSION
         )
-        kwargs = {
-            "DomainName": domain_name,
-            "EngineVersion": engine_version,
-            "ClusterConfig": _clusterconfig_to_opensearch(elasticsearch_cluster_config),
-            "EBSOptions": ebs_options,
-            "AccessPolicies": access_policies,
-            "SnapshotOptions": snapshot_options,
-            "VPCOptions": vpc_options,
-            "CognitoOptions": cognito_options,
-            "EncryptionAtRestOptions": encryption_at_rest_options,
-            "NodeToNodeEncryptionOptions": node_to_node_encryption_options,
-            "AdvancedOptions": advanced_options,
-            "LogPublishingOptions": log_publishing_options,
-            "DomainEndpointOptions": domain_endpoint_options,
-            "AdvancedSecurityOptions": advanced_security_options,
-            "AutoTuneOptions": auto_tune_options,
-            "TagList": tag_list,
-        }
-
-        # Filter the kwargs to not set None values at all (boto doesn't like that)
-        kwargs = {key: value for key, value in kwargs.items() if value is not None}
+        # Construct the kwargs directly, only adding non-None values (boto doesn't like None values)
+        kwargs = {"DomainName": domain_name, "EngineVersion": engine_version}
+        if elasticsearch_cluster_config is not None:
+            kwargs["ClusterConfig"] = _clusterconfig_to_opensearch(elasticsearch_cluster_config)
+        for key, value in zip(
+            self._CREATE_FIELDS,
+            (
+                ebs_options,
+                access_policies,
+                snapshot_options,
+                vpc_options,
+                cognito_options,
+                encryption_at_rest_options,
+                node_to_node_encryption_options,
+                advanced_options,
+                log_publishing_options,
+                domain_endpoint_options,
+                advanced_security_options,
+                auto_tune_options,
+                tag_list,
+            ),
+        ):
+            if value is not None:
+                kwargs[key] = value
 
         with exception_mapper():
             domain_status = opensearch_client.create_domain(**kwargs)["DomainStatus"]
@@ -267,7 +302,7 @@ class EsProvider(EsApi):
     def delete_elasticsearch_domain(
         self, context: RequestContext, domain_name: DomainName
     ) -> DeleteElasticsearchDomainResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
 
         with exception_mapper():
             domain_status = opensearch_client.delete_domain(
@@ -280,7 +315,7 @@ class EsProvider(EsApi):
     def describe_elasticsearch_domain(
         self, context: RequestContext, domain_name: DomainName
     ) -> DescribeElasticsearchDomainResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
 
         with exception_mapper():
             opensearch_status = opensearch_client.describe_domain(
@@ -294,7 +329,7 @@ class EsProvider(EsApi):
     def update_elasticsearch_domain_config(
         self, context: RequestContext, payload: UpdateElasticsearchDomainConfigRequest
     ) -> UpdateElasticsearchDomainConfigResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
 
         payload: Dict
         if "ElasticsearchClusterConfig" in payload:
@@ -313,20 +348,24 @@ class EsProvider(EsApi):
     def describe_elasticsearch_domains(
         self, context: RequestContext, domain_names: DomainNameList
     ) -> DescribeElasticsearchDomainsResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        # Skip the roundtrip to the backend, an empty request can only yield an empty response
+        if not domain_names:
+            return DescribeElasticsearchDomainsResponse(DomainStatusList=[])
+        opensearch_client = self._client(context.region)
 
         with exception_mapper():
             opensearch_status_list = opensearch_client.describe_domains(
                 DomainNames=domain_names,
             )["DomainStatusList"]
 
-        status_list = [_domainstatus_from_opensearch(s) for s in opensearch_status_list]
+        _dsfo = _domainstatus_from_opensearch
+        status_list = [_dsfo(s) for s in opensearch_status_list]
         return DescribeElasticsearchDomainsResponse(DomainStatusList=status_list)
 
     def list_domain_names(
         self, context: RequestContext, engine_type: EngineType = None
     ) -> ListDomainNamesResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
         # Only hand the EngineType param to boto if it's set
         kwargs = {}
         if engine_type:
@@ -335,7 +374,7 @@ class EsProvider(EsApi):
         with exception_mapper():
             domain_names = opensearch_client.list_domain_names(**kwargs)["DomainNames"]
 
-        return ListDomainNamesResponse(DomainNames=cast(Optional[DomainInfoList], domain_names))
+        return ListDomainNamesResponse(DomainNames=domain_names)
 
     def list_elasticsearch_versions(
         self,
@@ -343,7 +382,7 @@ class EsProvider(EsApi):
         max_results: MaxResults = None,
         next_token: NextToken = None,
     ) -> ListElasticsearchVersionsResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
         # Construct the arguments as kwargs to not set None values at all (boto doesn't like that)
         kwargs = {
             key: value
@@ -353,17 +392,16 @@ class EsProvider(EsApi):
         with exception_mapper():
             versions = opensearch_client.list_versions(**kwargs)
 
+        _vfo = _version_from_opensearch
         return ListElasticsearchVersionsResponse(
-            ElasticsearchVersions=[
-                _version_from_opensearch(version) for version in versions["Versions"]
-            ],
-            NextToken=versions.get(next_token),
+            ElasticsearchVersions=[_vfo(version) for version in versions["Versions"]],
+            NextToken=versions.get("NextToken"),
         )
 
     def get_compatible_elasticsearch_versions(
         self, context: RequestContext, domain_name: DomainName = None
     ) -> GetCompatibleElasticsearchVersionsResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
         # Only hand the DomainName param to boto if it's set
         kwargs = {}
         if domain_name:
@@ -374,15 +412,14 @@ class EsProvider(EsApi):
 
         compatible_versions = compatible_versions_response.get("CompatibleVersions")
         return GetCompatibleElasticsearchVersionsResponse(
-            CompatibleElasticsearchVersions=_compatible_version_list_from_opensearch(
-                compatible_versions
-            )
+            CompatibleElasticsearchVersions=compatible_versions
+            and _compatible_version_list_from_opensearch(compatible_versions)
         )
 
     def describe_elasticsearch_domain_config(
         self, context: RequestContext, domain_name: DomainName
     ) -> DescribeElasticsearchDomainConfigResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
 
         with exception_mapper():
             domain_config = opensearch_client.describe_domain_config(DomainName=domain_name).get(
@@ -390,17 +427,20 @@ class EsProvider(EsApi):
             )
 
         return DescribeElasticsearchDomainConfigResponse(
-            DomainConfig=_domainconfig_from_opensearch(domain_config)
+            DomainConfig=domain_config and _domainconfig_from_opensearch(domain_config)
         )
 
     def add_tags(self, context: RequestContext, arn: ARN, tag_list: TagList) -> None:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        # Nothing to do if no tags are given
+        if not tag_list:
+            return
+        opensearch_client = self._client(context.region)
 
         with exception_mapper():
             opensearch_client.add_tags(ARN=arn, TagList=tag_list)
 
     def list_tags(self, context: RequestContext, arn: ARN) -> ListTagsResponse:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        opensearch_client = self._client(context.region)
 
         with exception_mapper():
             response = opensearch_client.list_tags(ARN=arn)
@@ -408,7 +448,10 @@ class EsProvider(EsApi):
         return ListTagsResponse(TagList=response.get("TagList"))
 
     def remove_tags(self, context: RequestContext, arn: ARN, tag_keys: StringList) -> None:
-        opensearch_client = aws_stack.connect_to_service("opensearch", region_name=context.region)
+        # Nothing to do if no tag keys are given
+        if not tag_keys:
+            return
+        opensearch_client = self._client(context.region)
 
         with exception_mapper():
             opensearch_client.remove_tags(ARN=arn, TagKeys=tag_keys)